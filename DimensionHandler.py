@@ -1,245 +1,418 @@
-import math
-import FileHandler
-
-params_with_units = FileHandler.csv_to_map("Parameters.csv")
-params = dict()
-for name, (val, unit) in params_with_units.items():
-    params[name] = val
+import functools
+import logging
+from math import atan2, degrees, hypot, radians, sin, tan
+from FileHandler import Map, begin_batch, commit_batch, csv_to_map, map_to_text_file
+
+# Parameter source; swappable so a sweep driver can run main() over many configurations
+_params_file = "Parameters.csv"
+
+# Loads the parameter CSV at most once, on first use, so importing this module
+# (e.g. for the helpers alone) pays no file I/O
+@functools.lru_cache(maxsize=1)
+def _load_params():
+    params_with_units = csv_to_map(_params_file)
+    return (params_with_units, params_with_units.values)
+
+# Points the module at a different parameter CSV (e.g. one design point of a sweep)
+# and resets every cache derived from the previous parameters
+def set_params_file(file_path):
+    global _params_file
+    _params_file = file_path
+    _load_params.cache_clear()
+    get_pivot_housing_diameter.cache_clear()
+    _get_linkage_template.cache_clear()
+    _build_pivot_housing_template.cache_clear()
+    _get_spacer_thickness_table.cache_clear()
+    _build_spacer_template.cache_clear()
+
+# Keep module-level access to the maps working (PEP 562)
+def __getattr__(name):
+    if name == "params_with_units":
+        return _load_params()[0]
+    if name == "params":
+        return _load_params()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 ## VALIDATION ##
 
 def validate_rover_width():
-    target_frame_to_wheel_width = (params["rover_width"] - params["frame_width"]) / 2
-    frame_to_wheel_width = sum([
-        params["upper_shaft_frame_clearance"],
-        params["swingarm_thickness"],
-        2 * params["linkage_thickness"],
-        2 * params["middle_wheel_clearance"],
-        params["upper_shaft_overhang"],
-        params["middle_wheel_shaft_length"],
-        params["wheel_thickness"]
-    ])
+    p = _load_params()[1]
+    target_frame_to_wheel_width = (p["rover_width"] - p["frame_width"]) / 2
+    frame_to_wheel_width = (
+        p["upper_shaft_frame_clearance"] +
+        p["swingarm_thickness"] +
+        2 * p["linkage_thickness"] +
+        2 * p["middle_wheel_clearance"] +
+        p["upper_shaft_overhang"] +
+        p["middle_wheel_shaft_length"] +
+        p["wheel_thickness"]
+    )
     
     return (frame_to_wheel_width <= target_frame_to_wheel_width, frame_to_wheel_width)
 
 ## HELPERS ##
 
 # Takes "upper_" or "lower_" pivot prefix and returns housing diameter
+# Cached since params is fixed while main() runs and both prefixes are queried repeatedly
+@functools.lru_cache(maxsize=4)
 def get_pivot_housing_diameter(prefix):
-    return params[prefix + "bearing_diameter"] + 2 * (params["pivot_housing_bolt_diameter"] + 2 * params["pivot_housing_min_wall_thickness"])
-
-# Returns linkage angle (in degrees) and extended length
-def get_linkage_angle_and_extended_length(height, width):
-    return (math.degrees(math.atan2(height, width)), math.sqrt(height**2 + width**2))
+    p = _load_params()[1]
+    return p[prefix + "bearing_diameter"] + 2 * (p["pivot_housing_bolt_diameter"] + 2 * p["pivot_housing_min_wall_thickness"])
 
-# Constructs and returns linkage map
+# Constructs the constant portion of the linkage map once; length and angle placeholders
+# keep the file output order
 # ***ASSUMES BOLT SPACING = BOLT DIAMETER
-def get_linkage_map(length, angle):
-    return {
-        "linkage_thickness": (params["linkage_thickness"], "mm"),
-        "width": (params["linkage_width"], "mm"),
-        "wall_thickness": (params["linkage_wall_thickness"], "mm"),
-        "length": (length, "mm"),
-        "angle": (angle, None),
-        "bolt_diameter": (params["linkage_mount_bolt_diameter"], "mm"),
-        "bolt_spacing": (params["linkage_mount_bolt_diameter"], "mm") # Possibly reduce to fraction of bolt diameter
+@functools.lru_cache(maxsize=1)
+def _get_linkage_template():
+    p = _load_params()[1]
+    values = {
+        "linkage_thickness": p["linkage_thickness"],
+        "width": p["linkage_width"],
+        "wall_thickness": p["linkage_wall_thickness"],
+        "length": None,
+        "angle": None,
+        "bolt_diameter": p["linkage_mount_bolt_diameter"],
+        "bolt_spacing": p["linkage_mount_bolt_diameter"] # Possibly reduce to fraction of bolt diameter
     }
-
-# Constructs and returns partial shaft map
-def get_shaft_map(prefix):
-    return {
-        "shaft_diameter": (params[prefix + "shaft_diameter"], "mm"),
-        "ret_ring_inner_diameter": (params[prefix + "ret_ring_inner_diameter"], "mm"),
-        "ret_ring_thickness": (params[prefix + "ret_ring_thickness"], "mm")
+    units = {
+        "linkage_thickness": "mm",
+        "width": "mm",
+        "wall_thickness": "mm",
+        "length": "mm",
+        "angle": None,
+        "bolt_diameter": "mm",
+        "bolt_spacing": "mm"
     }
+    return Map(values, units)
+
+# Constructs and returns linkage map
+def get_linkage_map(length, angle):
+    template = _get_linkage_template()
+    values = template.values.copy()
+    values["length"] = length
+    values["angle"] = angle
+    # Units are constant across linkages, so the template's dict is shared
+    return Map(values, template.units)
 
 ### All 'update' functions update respective text files and return maps ###
 
 ## LINKAGES ##
 
+# Takes precomputed frame centerline height (h1)
 # Side-effect: updates "front_steering_mount_base_length" in params_with_units map and text file
-def update_front_rocker_linkage():
+def update_front_rocker_linkage(frame_centerline_height):
+    # Cache repeated lookups as locals
+    params_with_units, p = _load_params()
+    linkage_width = p["linkage_width"]
+
     # Compute length and angle
-    height = ( params["ground_clearance"] + (0.5 * params["frame_height"]) ) - ( params["corner_wheel_asm_height"] + params["steering_asm_height"] ) # h1 - h2
-    width = 0.5 * (params["rover_length"] - params["wheel_diameter"]) # w 
-    angle, extended_length = get_linkage_angle_and_extended_length(height, width) #theta, l
-    angle_rad = math.radians(angle)
+    height = frame_centerline_height - ( p["corner_wheel_asm_height"] + p["steering_asm_height"] ) # h1 - h2
+    width = 0.5 * (p["rover_length"] - p["wheel_diameter"]) # w
+    angle = degrees(atan2(height, width)) #theta
+    extended_length = hypot(height, width) #l
+    angle_rad = radians(angle)
     upper_pivot_housing_radius = get_pivot_housing_diameter("upper_") / 2 # R
-    offset = params["linkage_width"] / (2 * math.tan(angle_rad)) # d
-    length = extended_length - (upper_pivot_housing_radius + params["linkage_mount_base_length"] + offset) # l - (R + b + d)
-    
-    # Update "front_steering_mount_base_length" in params_with_units map and text file  
-    params_with_units["front_steering_mount_base_length"] = (params["linkage_width"] / math.sin(angle_rad), "mm")
-    FileHandler.map_to_text_file(params_with_units, "params.txt")
+    offset = linkage_width / (2 * tan(angle_rad)) # d
+    length = extended_length - (upper_pivot_housing_radius + p["linkage_mount_base_length"] + offset) # l - (R + b + d)
+
+    # Update "front_steering_mount_base_length" in params_with_units map and text file
+    params_with_units.values["front_steering_mount_base_length"] = linkage_width / sin(angle_rad)
+    params_with_units.units["front_steering_mount_base_length"] = "mm"
+    map_to_text_file(params_with_units, "params.txt")
 
     # Update linkage file and return map
     linkage = get_linkage_map(length, angle)
-    FileHandler.map_to_text_file(linkage, "front_rocker_linkage.txt")
+    map_to_text_file(linkage, "front_rocker_linkage.txt")
     return linkage
 
-def update_rear_rocker_linkage():
+# Takes precomputed h1, rear mount height (h2 + n_y), quarter rover length, and half linkage width
+def update_rear_rocker_linkage(frame_centerline_height, rear_mount_height, quarter_length, half_linkage_width):
+    # Cache repeated lookups as locals
+    p = _load_params()[1]
+
     # Compute length and angle
-    height = ( ( params["ground_clearance"] + (0.5 * params["frame_height"]) ) - 
-        ( params["corner_wheel_asm_height"] + params["steering_asm_height"] + params["rear_steering_mount_neck_height"] + (params["linkage_width"] / 2) ) ) # h1 - h2 - (n_y + t / 2)
-    width = params["rover_length"] / 4 # w
-    angle, extended_length = get_linkage_angle_and_extended_length(height, width) #theta, l
+    height = frame_centerline_height - ( rear_mount_height + half_linkage_width ) # h1 - h2 - (n_y + t / 2)
+    width = quarter_length # w
+    angle = degrees(atan2(height, width)) #theta
+    extended_length = hypot(height, width) #l
     upper_pivot_housing_radius = get_pivot_housing_diameter("upper_") / 2 # R
     lower_pivot_housing_radius = get_pivot_housing_diameter("lower_") / 2 # r
-    length = extended_length - (upper_pivot_housing_radius + lower_pivot_housing_radius + (2 * params["linkage_mount_base_length"])) # l - (R + r + 2b)
+    length = extended_length - (upper_pivot_housing_radius + lower_pivot_housing_radius + (2 * p["linkage_mount_base_length"])) # l - (R + r + 2b)
 
     # Update linkage file and return map
     linkage = get_linkage_map(length, angle)
-    FileHandler.map_to_text_file(linkage, "rear_rocker_linkage.txt")
+    map_to_text_file(linkage, "rear_rocker_linkage.txt")
     return linkage
 
-def update_middle_bogie_linkage():
+# Takes precomputed rear mount height (h2 + n_y), quarter rover length, and half linkage width
+def update_middle_bogie_linkage(rear_mount_height, quarter_length, half_linkage_width):
+    # Cache repeated lookups as locals
+    p = _load_params()[1]
+
     # Compute length and angle
-    height = params["corner_wheel_asm_height"] + params["steering_asm_height"] + params["rear_steering_mount_neck_height"] + (params["linkage_width"] / 2) - (params["wheel_diameter"] / 2) # h2 + n_y + t/2 + D_w/2
-    width = params["rover_length"] / 4 # w
-    angle, extended_length = get_linkage_angle_and_extended_length(height, width) #theta, l
+    height = rear_mount_height + half_linkage_width - (p["wheel_diameter"] / 2) # h2 + n_y + t/2 + D_w/2
+    width = quarter_length # w
+    angle = degrees(atan2(height, width)) #theta
+    extended_length = hypot(height, width) #l
     lower_pivot_housing_radius = get_pivot_housing_diameter("lower_") / 2 # r
-    length = extended_length - (lower_pivot_housing_radius + (params["middle_wheel_shaft_diameter"] / 2) + (2 * params["linkage_mount_base_length"])) # l - (R + r_ws + 2b)
+    length = extended_length - (lower_pivot_housing_radius + (p["middle_wheel_shaft_diameter"] / 2) + (2 * p["linkage_mount_base_length"])) # l - (R + r_ws + 2b)
 
     # Update linkage file and return map
     linkage = get_linkage_map(length, angle)
-    FileHandler.map_to_text_file(linkage, "middle_bogie_linkage.txt")
+    map_to_text_file(linkage, "middle_bogie_linkage.txt")
     return linkage
 
-def update_rear_bogie_linkage():
+# Takes precomputed quarter rover length
+def update_rear_bogie_linkage(quarter_length):
+    # Cache repeated lookups as locals
+    p = _load_params()[1]
+
     # Compute length and angle
-    width = params["rover_length"] / 4 # w
+    width = quarter_length # w
     lower_pivot_housing_radius = get_pivot_housing_diameter("lower_") / 2 # r
-    length = width - (lower_pivot_housing_radius + (params["wheel_diameter"] / 2) + (2.5 * params["linkage_mount_base_length"])) # w - (r + D_w/2 + n_x/2 + 2b)
+    length = width - (lower_pivot_housing_radius + (p["wheel_diameter"] / 2) + (2.5 * p["linkage_mount_base_length"])) # w - (r + D_w/2 + n_x/2 + 2b)
 
     # Update linkage file and return map
     linkage = get_linkage_map(length, 0)
-    FileHandler.map_to_text_file(linkage, "rear_bogie_linkage.txt")
+    map_to_text_file(linkage, "rear_bogie_linkage.txt")
     return linkage
 
 ## PIVOT HOUSINGS & SPACERS ##
 
-# Takes prefix and angles of housed linkages
+_PIVOT_HOUSING_UNITS = {
+    "housing_diameter": "mm",
+    "housing_thickness": "mm",
+    "bearing_diameter": "mm",
+    "bearing_outer_race_inner_diameter": "mm",
+    "bearing_thickness": "mm",
+    "housing_min_wall_thickness": "mm",
+    "housing_bolt_diameter": "mm",
+    "linkage_separation_angle": None,
+    "bolt_placement_radius": "mm",
+    "num_bolts": None,
+    "linkage_mount_base_width": "mm",
+    "linkage_mount_base_length": "mm",
+    "linkage_mount_shoulder_depth": "mm",
+    "linkage_mount_bolt_diameter": "mm",
+    "linkage_mount_bolt_spacing": "mm",
+    "linkage_mount_tongue_length": "mm"
+}
+
+# Constructs the constant portion of the pivot housing values for a given prefix once;
+# only linkage_separation_angle varies per call, so it stays a placeholder
 # ***ASSUMES BOLT SPACING = BOLT DIAMETER
-def update_pivot_housing(prefix, interior_angle_1, interior_angle_2):
-    pivot_housing = {
-        "housing_diameter": (get_pivot_housing_diameter(prefix), "mm"),
-        "housing_thickness": (params["linkage_thickness"], "mm"),
-
-        "bearing_diameter": (params[prefix + "bearing_diameter"], "mm"),
-        "bearing_outer_race_inner_diameter": (params[prefix + "bearing_outer_race_inner_diameter"], "mm"),
-        "bearing_thickness": (params[prefix + "bearing_thickness"], "mm"),
-
-        "housing_min_wall_thickness": (params["pivot_housing_min_wall_thickness"], "mm"),
-        "housing_bolt_diameter": (params["pivot_housing_bolt_diameter"], "mm"),
-        "linkage_separation_angle": (180 - (interior_angle_1 + interior_angle_2), None),
-        "bolt_placement_radius": None,
-        "num_bolts": (params[prefix + "pivot_housing_num_bolts"], None),
-
-        "linkage_mount_base_width": (params["linkage_width"], "mm"),
-        "linkage_mount_base_length": (params["linkage_mount_base_length"], "mm"),
-        "linkage_mount_shoulder_depth": (params["linkage_wall_thickness"], "mm"), # TODO add tolerance
-        "linkage_mount_bolt_diameter": (params["linkage_mount_bolt_diameter"], "mm"),
-        "linkage_mount_bolt_spacing": None,
-        "linkage_mount_tongue_length": None
+@functools.lru_cache(maxsize=4)
+def _build_pivot_housing_template(prefix):
+    # Cache repeated lookups as locals
+    p = _load_params()[1]
+    bearing_diameter = p[prefix + "bearing_diameter"]
+    min_wall_thickness = p["pivot_housing_min_wall_thickness"]
+    housing_bolt_diameter = p["pivot_housing_bolt_diameter"]
+    mount_bolt_diameter = p["linkage_mount_bolt_diameter"]
+
+    # Derived dimensions as scalars, so the map is built in one literal with no read-backs
+    bolt_placement_radius = (bearing_diameter / 2) + min_wall_thickness + (housing_bolt_diameter / 2)
+    mount_bolt_spacing = mount_bolt_diameter # Possibly reduce to fraction of bolt diameter
+    mount_tongue_length = 3 * mount_bolt_spacing + 2 * mount_bolt_diameter # Only accounts for 2 bolts
+
+    return {
+        "housing_diameter": get_pivot_housing_diameter(prefix),
+        "housing_thickness": p["linkage_thickness"],
+
+        "bearing_diameter": bearing_diameter,
+        "bearing_outer_race_inner_diameter": p[prefix + "bearing_outer_race_inner_diameter"],
+        "bearing_thickness": p[prefix + "bearing_thickness"],
+
+        "housing_min_wall_thickness": min_wall_thickness,
+        "housing_bolt_diameter": housing_bolt_diameter,
+        "linkage_separation_angle": None,
+        "bolt_placement_radius": bolt_placement_radius,
+        "num_bolts": p[prefix + "pivot_housing_num_bolts"],
+
+        "linkage_mount_base_width": p["linkage_width"],
+        "linkage_mount_base_length": p["linkage_mount_base_length"],
+        "linkage_mount_shoulder_depth": p["linkage_wall_thickness"], # TODO add tolerance
+        "linkage_mount_bolt_diameter": mount_bolt_diameter,
+        "linkage_mount_bolt_spacing": mount_bolt_spacing,
+        "linkage_mount_tongue_length": mount_tongue_length
     }
-    pivot_housing["bolt_placement_radius"] = ((pivot_housing["bearing_diameter"][0] / 2) + pivot_housing["housing_min_wall_thickness"][0] + (pivot_housing["housing_bolt_diameter"][0] / 2), "mm")
-    pivot_housing["linkage_mount_bolt_spacing"] = (pivot_housing["linkage_mount_bolt_diameter"][0], "mm") # Possibly reduce to fraction of bolt diameter
-    pivot_housing["linkage_mount_tongue_length"] = (3 * pivot_housing["linkage_mount_bolt_spacing"][0] + 2 * pivot_housing["linkage_mount_bolt_diameter"][0], "mm") # Only accounts for 2 bolts
-    
-    FileHandler.map_to_text_file(pivot_housing, prefix + "pivot_housing.txt")
+
+# Takes prefix and angles of housed linkages
+def update_pivot_housing(prefix, interior_angle_1, interior_angle_2):
+    values = _build_pivot_housing_template(prefix).copy()
+    values["linkage_separation_angle"] = 180 - (interior_angle_1 + interior_angle_2)
+
+    pivot_housing = Map(values, _PIVOT_HOUSING_UNITS)
+    map_to_text_file(pivot_housing, prefix + "pivot_housing.txt")
     return pivot_housing
 
-# Takes respective pivot_housing map
-def update_spacer(prefix, pivot_housing):
-    spacer = {
-        "outer_diameter": (pivot_housing["housing_diameter"][0], "mm"),
-        "inner_diameter": (pivot_housing["bearing_diameter"][0], "mm"),
-        "spacer_thickness": None,
-        "bolt_diameter": (pivot_housing["housing_bolt_diameter"][0], "mm"),
-        "bolt_placement_radius": (pivot_housing["bolt_placement_radius"][0], "mm"),
-        "num_bolts": (params[prefix + "pivot_housing_num_bolts"], None)
+_SPACER_UNITS = {
+    "outer_diameter": "mm",
+    "inner_diameter": "mm",
+    "spacer_thickness": "mm",
+    "bolt_diameter": "mm",
+    "bolt_placement_radius": "mm",
+    "num_bolts": None
+}
+
+# Spacer thickness by pivot prefix, computed once per parameter load
+@functools.lru_cache(maxsize=1)
+def _get_spacer_thickness_table():
+    p = _load_params()[1]
+    return {
+        "upper_": p["middle_wheel_clearance"],
+        "lower_": p["upper_shaft_overhang"] + p["middle_wheel_clearance"] + p["middle_wheel_shaft_overhang"]
     }
 
-    if prefix == "upper_":
-        thickness = params["middle_wheel_clearance"]
-    else:
-        thickness = params["upper_shaft_overhang"] + params["middle_wheel_clearance"] + params["middle_wheel_shaft_overhang"]
+# Constructs the spacer values for a given prefix once; they are fully determined by
+# params via the respective pivot housing template
+@functools.lru_cache(maxsize=4)
+def _build_spacer_template(prefix):
+    # Cache repeated lookups as locals
+    p = _load_params()[1]
+    housing_values = _build_pivot_housing_template(prefix)
 
-    spacer["spacer_thickness"] = (thickness, "mm")
-    
-    FileHandler.map_to_text_file(spacer, prefix + "spacer.txt")
+    return {
+        "outer_diameter": housing_values["housing_diameter"],
+        "inner_diameter": housing_values["bearing_diameter"],
+        "spacer_thickness": _get_spacer_thickness_table()[prefix],
+        "bolt_diameter": housing_values["housing_bolt_diameter"],
+        "bolt_placement_radius": housing_values["bolt_placement_radius"],
+        "num_bolts": p[prefix + "pivot_housing_num_bolts"]
+    }
+
+# Takes prefix of respective pivot housing
+def update_spacer(prefix):
+    spacer = Map(_build_spacer_template(prefix), _SPACER_UNITS)
+    map_to_text_file(spacer, prefix + "spacer.txt")
     return spacer
 
 ## SHAFTS ##
 # Take spacer thicknesses
 # Side-effect: prints min bolt length
 
+_UPPER_SHAFT_UNITS = {
+    "shaft_diameter": "mm",
+    "ret_ring_inner_diameter": "mm",
+    "ret_ring_thickness": "mm",
+    "ret_ring_1_pos": "mm",
+    "ret_ring_2_pos": "mm",
+    "length": "mm"
+}
+
+_LOWER_SHAFT_UNITS = {
+    "shaft_diameter": "mm",
+    "ret_ring_inner_diameter": "mm",
+    "ret_ring_thickness": "mm",
+    "ret_ring_1_pos": "mm",
+    "ret_ring_2_pos": "mm",
+    "ret_ring_3_pos": "mm",
+    "ret_ring_4_pos": "mm",
+    "length": "mm"
+}
+
 def update_upper_shaft(upper_spacer_thickness):
+    # Cache repeated lookups as locals
+    p = _load_params()[1]
+    upper_shaft_frame_clearance = p["upper_shaft_frame_clearance"]
+
     # Compute retention ring positions and length
-    ret_ring_1_pos = params["upper_shaft_frame_clearance"] + params["swingarm_thickness"]
-    ret_ring_2_pos = ret_ring_1_pos + 2 * params["linkage_thickness"] + upper_spacer_thickness
-    length = 2 * (ret_ring_2_pos + params["upper_shaft_overhang"]) + params["rover_width"]
+    ret_ring_1_pos = upper_shaft_frame_clearance + p["swingarm_thickness"]
+    ret_ring_2_pos = ret_ring_1_pos + 2 * p["linkage_thickness"] + upper_spacer_thickness
+    length = 2 * (ret_ring_2_pos + p["upper_shaft_overhang"]) + p["rover_width"]
 
-    # Print min bolt length
-    min_bolt_length = ret_ring_2_pos - params["upper_shaft_frame_clearance"]
-    print(f"Min upper bolt length: {min_bolt_length}mm\n")
+    # Log min bolt length
+    min_bolt_length = ret_ring_2_pos - upper_shaft_frame_clearance
+    logging.info("Min upper bolt length: %smm\n", min_bolt_length)
 
     # Update file and return map
-    shaft = get_shaft_map("upper_")
-    shaft["ret_ring_1_pos"] = (ret_ring_1_pos, "mm")
-    shaft["ret_ring_2_pos"] = (ret_ring_2_pos, "mm")
-    shaft["length"] = (length, "mm")
-
-    FileHandler.map_to_text_file(shaft, "upper_shaft.txt")
+    shaft = Map({
+        "shaft_diameter": p["upper_shaft_diameter"],
+        "ret_ring_inner_diameter": p["upper_ret_ring_inner_diameter"],
+        "ret_ring_thickness": p["upper_ret_ring_thickness"],
+        "ret_ring_1_pos": ret_ring_1_pos,
+        "ret_ring_2_pos": ret_ring_2_pos,
+        "length": length
+    }, _UPPER_SHAFT_UNITS)
+
+    map_to_text_file(shaft, "upper_shaft.txt")
     return shaft
 
 def update_lower_shaft(upper_spacer_thickness, lower_spacer_thickness):
+    # Cache repeated lookups as locals
+    p = _load_params()[1]
+    linkage_thickness = p["linkage_thickness"]
+    lower_shaft_overhang = p["lower_shaft_overhang"]
+
     # Compute retention ring positions and length
-    ret_ring_1_pos = params["lower_shaft_overhang"]
-    ret_ring_2_pos = ret_ring_1_pos + params["linkage_thickness"]
-    ret_ring_3_pos = ret_ring_2_pos + upper_spacer_thickness 
-    ret_ring_4_pos = ret_ring_3_pos + 2 * params["linkage_thickness"] + lower_spacer_thickness 
-    length = ret_ring_4_pos + params["lower_shaft_overhang"]
+    ret_ring_1_pos = lower_shaft_overhang
+    ret_ring_2_pos = ret_ring_1_pos + linkage_thickness
+    ret_ring_3_pos = ret_ring_2_pos + upper_spacer_thickness
+    ret_ring_4_pos = ret_ring_3_pos + 2 * linkage_thickness + lower_spacer_thickness
+    length = ret_ring_4_pos + lower_shaft_overhang
     
-    # Print min bolt length
+    # Log min bolt length
     min_bolt_length = ret_ring_4_pos - ret_ring_3_pos
-    print(f"Min lower bolt length: {min_bolt_length}mm\n")
+    logging.info("Min lower bolt length: %smm\n", min_bolt_length)
 
     # Update file and return map
-    shaft = get_shaft_map("lower_")
-    shaft["ret_ring_1_pos"] = (ret_ring_1_pos, "mm")
-    shaft["ret_ring_2_pos"] = (ret_ring_2_pos, "mm")
-    shaft["ret_ring_3_pos"] = (ret_ring_3_pos, "mm")
-    shaft["ret_ring_4_pos"] = (ret_ring_4_pos, "mm")
-    shaft["length"] = (length, "mm")
-
-    FileHandler.map_to_text_file(shaft, "lower_shaft.txt")
+    shaft = Map({
+        "shaft_diameter": p["lower_shaft_diameter"],
+        "ret_ring_inner_diameter": p["lower_ret_ring_inner_diameter"],
+        "ret_ring_thickness": p["lower_ret_ring_thickness"],
+        "ret_ring_1_pos": ret_ring_1_pos,
+        "ret_ring_2_pos": ret_ring_2_pos,
+        "ret_ring_3_pos": ret_ring_3_pos,
+        "ret_ring_4_pos": ret_ring_4_pos,
+        "length": length
+    }, _LOWER_SHAFT_UNITS)
+
+    map_to_text_file(shaft, "lower_shaft.txt")
     return shaft
 
 ## MAIN ##
 
-def main():
+# Optionally takes a parameter CSV path so sweeps can rerun the pipeline per design point
+def main(params_file=None):
+    if params_file is not None:
+        set_params_file(params_file)
+
     # Validation
-    print(f"Rover width is valid: {validate_rover_width()}\n")
-    
+    logging.info("Rover width is valid: %s\n", validate_rover_width())
+
+    # Buffer all text file writes and flush them once at the end
+    begin_batch()
+
+    # Precompute subexpressions shared across linkage computations
+    p = _load_params()[1]
+    frame_centerline_height = p["ground_clearance"] + (0.5 * p["frame_height"]) # h1
+    rear_mount_height = p["corner_wheel_asm_height"] + p["steering_asm_height"] + p["rear_steering_mount_neck_height"] # h2 + n_y
+    quarter_length = p["rover_length"] / 4 # w
+    half_linkage_width = p["linkage_width"] / 2 # t / 2
+
     # Linkages
-    front_rocker_linkage = update_front_rocker_linkage()
-    rear_rocker_linkage = update_rear_rocker_linkage()
-    middle_bogie_linkage = update_middle_bogie_linkage()
-    rear_bogie_linkage = update_rear_bogie_linkage()
+    front_rocker_linkage = update_front_rocker_linkage(frame_centerline_height)
+    rear_rocker_linkage = update_rear_rocker_linkage(frame_centerline_height, rear_mount_height, quarter_length, half_linkage_width)
+    middle_bogie_linkage = update_middle_bogie_linkage(rear_mount_height, quarter_length, half_linkage_width)
+    rear_bogie_linkage = update_rear_bogie_linkage(quarter_length)
 
     # Pivot housings
-    upper_pivot_housing = update_pivot_housing("upper_", front_rocker_linkage["angle"][0], rear_rocker_linkage["angle"][0])
-    lower_pivot_housing = update_pivot_housing("lower_", middle_bogie_linkage["angle"][0], rear_bogie_linkage["angle"][0])
+    update_pivot_housing("upper_", front_rocker_linkage.values["angle"], rear_rocker_linkage.values["angle"])
+    update_pivot_housing("lower_", middle_bogie_linkage.values["angle"], rear_bogie_linkage.values["angle"])
 
     # Spacers
-    upper_spacer = update_spacer("upper_", upper_pivot_housing)
-    lower_spacer = update_spacer("lower_", lower_pivot_housing)
+    upper_spacer = update_spacer("upper_")
+    lower_spacer = update_spacer("lower_")
 
     # Shafts
-    update_upper_shaft(upper_spacer["spacer_thickness"][0])
-    update_lower_shaft(upper_spacer["spacer_thickness"][0], lower_spacer["spacer_thickness"][0])
+    update_upper_shaft(upper_spacer.values["spacer_thickness"])
+    update_lower_shaft(upper_spacer.values["spacer_thickness"], lower_spacer.values["spacer_thickness"])
+
+    # Flush buffered writes
+    commit_batch()
 
     return
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
\ No newline at end of file
@@ -1,8 +1,30 @@
 import re
 import csv
+from collections import namedtuple
+
+# Parallel value/unit dicts; units are only consulted when writing files,
+# so computations index a plain float dict with no per-access tuple unpacking
+Map = namedtuple("Map", ("values", "units"))
+
+# Pending (dimensions, file_path) writes while batching; None means write immediately
+_batch = None
+
+# Starts buffering map_to_text_file calls instead of writing each file immediately
+def begin_batch():
+    global _batch
+    _batch = []
+
+# Writes all buffered maps to their files and resumes immediate writes
+def commit_batch():
+    global _batch
+    pending, _batch = _batch, None
+    if pending:
+        for dimensions, file_path in pending:
+            _write_map(dimensions, file_path)
 
 def text_file_to_map(file_path):
-    dimensions = {}
+    values = {}
+    units = {}
     try:
         with open(file_path, 'r', encoding='utf-8-sig') as file:
             for line in file:
@@ -13,16 +35,16 @@ def text_file_to_map(file_path):
                     match = re.match(r'"([^"]+)"\s*=\s*([\d.]+)\s*([a-zA-Z]*)', line)
                     if match:
                         dimension_name = match.group(1)
-                        dimension_value = float(match.group(2))
-                        dimension_unit = match.group(3) or None
-                        dimensions[dimension_name] = (dimension_value, dimension_unit)
-        return dimensions
+                        values[dimension_name] = float(match.group(2))
+                        units[dimension_name] = match.group(3) or None
+        return Map(values, units)
     except Exception as e:
         print(f"An error occurred while processing the file: {e}")
-        return {}
+        return Map({}, {})
 
 def csv_to_map(file_path):
-    dimensions = {}
+    values = {}
+    units = {}
     with open(file_path, newline='', encoding='utf-8-sig') as csvfile:
         reader = csv.reader(csvfile)
         for row in reader:
@@ -34,16 +56,24 @@ def csv_to_map(file_path):
                 except ValueError:
                     # Handle the case where the value is not a valid float
                     continue
-                unit = row[2] if row[2] else None
-                dimensions[key] = (value, unit)
-    return dimensions
+                values[key] = value
+                units[key] = row[2] or None
+    return Map(values, units)
 
 def map_to_text_file(dimensions, file_path):
+    # Defer the write if a batch is open
+    if _batch is not None:
+        _batch.append((dimensions, file_path))
+        return
+    _write_map(dimensions, file_path)
+
+def _write_map(dimensions, file_path):
     try:
         with open(file_path, 'w', encoding='utf-8-sig') as file:
-            for dimension_name, (dimension_value, dimension_unit) in dimensions.items():
+            units = dimensions.units
+            for dimension_name, dimension_value in dimensions.values.items():
                 # Handling the case where the dimension is unitless
-                unit_str = dimension_unit if dimension_unit != None else ''
+                unit_str = units.get(dimension_name) or ''
                 file.write(f'"{dimension_name}"= {dimension_value}{unit_str}\n\n')
     except Exception as e:
         print(f"An error occurred while writing to the file: {e}")
\ No newline at end of file